@@ -1,11 +1,109 @@
+import hashlib
+import importlib.util
+import multiprocessing
+import os
+import pickle
 import re
+import sys
+import tempfile
 import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
+import fitz  # PyMuPDF
 import xml.etree.ElementTree as ET
 import streamlit as st
-from pypdf import PdfReader
+from streamlit import runtime
+
+# 解析結果キャッシュの形式を変えた場合はこの値を上げて古いキャッシュを無効化する
+_CACHE_VERSION = 4
+
+# 製品一覧・薬価情報のメモリキャッシュの有効期間（秒）
+_LISTING_CACHE_TTL = 300
+
+# テキスト処理で繰り返し使う正規表現
+_RE_MULTI_WS = re.compile(r'\n{3,}| {2,}')  # 3つ以上の連続改行・連続スペース
+_RE_HEADING = re.compile(r'^[\d\【].{3,50}')
+
+# XMLを逐次パースする際の読み込み単位（バイト）
+_XML_READ_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=4096)
+def _nfkc(text: str) -> str:
+    """NFKC正規化（同じファイル名が繰り返し判定されるため結果をキャッシュする）"""
+    return unicodedata.normalize('NFKC', text)
+
+
+def _walk_document_files(dir_path: str) -> Iterator[os.DirEntry]:
+    """フォルダを再帰的に1回だけ走査し、PDF・XMLファイルを返す"""
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_document_files(entry.path)
+            elif entry.name.endswith(('.pdf', '.xml')):
+                yield entry
+
+
+def _can_use_process_pool() -> bool:
+    """
+    文書の解析にプロセスプールを安全に使えるか判定する
+
+    spawn方式では子プロセスがメインスクリプトを再実行してしまう（Streamlitでは app.py が
+    __main__ になり再実行される）ため fork 方式が使える環境に限る。また fork すると
+    サーバーのスレッドごと複製してしまうため、Streamlit の実行中は使わない。
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return False
+    return not runtime.exists()
+
+
+def _collapse_whitespace(match: re.Match) -> str:
+    """連続改行は2つに、連続スペースは1つに置き換える"""
+    return '\n\n' if match.group()[0] == '\n' else ' '
+
+
+class _XmlTextCollector:
+    """XMLパーサーのターゲット。要素木を構築せず文字データを文書順に集める"""
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+
+    def data(self, data: str) -> None:
+        self._parts.append(data)
+
+    def close(self) -> str:
+        return ''.join(self._parts)
+
+
+@dataclass
+class Document:
+    """
+    読み込んだ医薬品文書
+
+    セクション分割は sections に初めてアクセスしたときに行う。
+    """
+
+    full_text: str
+    file_name: str
+    file_path: str
+    pages: Optional[int]
+    doc_type: str
+    doc_type_ja: str
+    product_type: Optional[str] = None
+    company_type: Optional[str] = None
+    product_name: Optional[str] = None
+    # PDFの各ページ本文の full_text 内での位置 (開始, 終了)
+    page_spans: Optional[List[Tuple[int, int]]] = field(default=None, repr=False)
+
+    @cached_property
+    def sections(self) -> List[Dict[str, Any]]:
+        """見出し単位のセクションのリスト"""
+        return DocumentLoader._extract_sections(self)
 
 
 class DocumentLoader:
@@ -18,6 +116,61 @@ class DocumentLoader:
         """
         self.data_dir = Path(data_dir)
 
+    def _cache_path(self, file_path: Path) -> Path:
+        """
+        ファイルのパス・更新時刻・サイズから解析結果キャッシュのパスを求める
+
+        Args:
+            file_path: 元ファイルのパス
+
+        Returns:
+            キャッシュファイルのパス
+        """
+        stat = file_path.stat()
+        key = hashlib.blake2b(
+            f"{_CACHE_VERSION}:{file_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        return self.data_dir / '.cache' / f'{key}.pkl'
+
+    def _read_cache(self, cache_path: Path) -> Optional[Document]:
+        """キャッシュ済みの解析結果を読み込む（存在しない・壊れている場合はNone）"""
+        try:
+            with open(cache_path, 'rb') as f:
+                return Document(**pickle.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ キャッシュの読み込みに失敗: {cache_path.name} ({e})")
+            return None
+
+    def _write_cache(self, cache_path: Path, doc: Document) -> None:
+        """
+        解析結果をキャッシュに書き込む（一時ファイル経由で置き換える）
+
+        クラスを pickle すると実行時のモジュール名（__main__ など）に依存するため、
+        フィールドの辞書として保存する。
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(asdict(doc), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            print(f"⚠️ キャッシュの書き込みに失敗: {cache_path.name} ({e})")
+
+    def _load_cached(self, file_path: Path) -> Optional[Document]:
+        """ファイルを解析せずにキャッシュだけから文書を取得する（なければNone）"""
+        try:
+            return self._read_cache(self._cache_path(file_path))
+        except OSError:
+            return None
+
     def _detect_document_type(self, file_name: str) -> str:
         """
         ファイル名から文書タイプを判定
@@ -28,22 +181,29 @@ class DocumentLoader:
         Returns:
             文書タイプ
         """
-        # 全角を半角に変換
-        file_name_normalized = unicodedata.normalize('NFKC', file_name)
+        # 全角を半角に変換（ASCIIのみのファイル名は既にNFKCなので正規化を省略）
+        # 現在のデータでは判定に使う "IF.pdf"・"RMP"・"患者向けガイド" はいずれも正規化不要だが、
+        # macOSではファイル名がNFD（"ガ" が "カ" + 濁点の結合文字）で返ることがあり、
+        # その場合 "患者向けガイド" に一致させるため正規化は残している
+        if file_name.isascii():
+            file_name_normalized = file_name
+        else:
+            file_name_normalized = _nfkc(file_name)
 
         # 判定ロジック（優先順位順）- 正規化後のファイル名で判定
         if file_name_normalized.endswith('.xml'):
             return '電子添文'
-        elif '_IF.pdf' in file_name_normalized or 'IF.pdf' in file_name_normalized:
+        elif file_name_normalized.endswith('IF.pdf'):  # "_IF.pdf" も含む
             return 'インタビューフォーム'
-        elif '_RMP' in file_name_normalized or 'RMP' in file_name_normalized:
+        elif 'RMP' in file_name_normalized:  # "_RMP" も含む
             return '医薬品リスク管理計画'
-        elif '患者向けガイド' in file_name_normalized or '患者向けガイド' in file_name:
+        elif '患者向けガイド' in file_name_normalized:
             return '患者向け医薬品ガイド'
         else:
             return 'その他'
     
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _clean_text(text: str) -> str:
         """
         テキストを正規化
         
@@ -53,68 +213,63 @@ class DocumentLoader:
         Returns:
             正規化されたテキスト
         """
-        # 改行の整理
-        text = re.sub(r'\n{3,}', '\n\n', text)  # 3つ以上の連続改行を2つに
-        
-        # 全角・半角の統一
-        text = text.replace('　', ' ')  # 全角スペースを半角に
+        # 全角・半角の統一（全角スペース・ノーブレークスペース・タブを半角スペースに）
+        # str.translate は日本語テキストでは1文字ずつの変換になり遅いため replace を重ねる
+        text = text.replace('\u3000', ' ').replace('\u00a0', ' ').replace('\t', ' ')
         
-        # 不要な空白の除去
-        text = re.sub(r' {2,}', ' ', text)  # 連続スペースを1つに
+        # 改行・空白の整理（3つ以上の連続改行を2つに、連続スペースを1つに）
+        text = _RE_MULTI_WS.sub(_collapse_whitespace, text)
         
         return text.strip()
     
-    def _extract_sections_from_text(self, text: str, file_name: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _extract_sections(document: Document) -> List[Dict[str, Any]]:
         """
-        テキストから見出し単位でセクションを抽出
-        
+        文書からセクションを抽出（Document.sections から呼び出される）
+
         Args:
-            text: 全文テキスト
-            file_name: ファイル名
-            
+            document: 文書
+
         Returns:
             セクションのリスト
         """
-        sections = []
+        # PDFは読み込み時に記録したページ位置から切り出し、
+        # ページ情報のない文書(XMLの電子添文など)は全文を1セクションとして扱う
+        if document.page_spans is not None:
+            pages = [
+                (page_num, document.full_text[start:end])
+                for page_num, (start, end) in enumerate(document.page_spans, 1)
+            ]
+        else:
+            pages = [(None, document.full_text)]
         
-        # ページ区切りで分割
-        pages = text.split('--- ページ')
+        is_xml = document.file_path.endswith('.xml')
         
-        for page_text in pages:
-            if not page_text.strip():
-                continue
-            
-            # ページ番号の抽出
-            page_match = re.match(r'(\d+) ---', page_text)
-            page_num = int(page_match.group(1)) if page_match else None
-            
-            section_text = page_text
-            if page_match:
-                section_text = page_text[page_match.end():]
-            
-            # セクションとして保存
+        sections = []
+        for page_num, section_text in pages:
             sections.append({
-                'text': self._clean_text(section_text),
+                'text': DocumentLoader._clean_text(section_text),
                 'page': page_num,
-                'heading': self._extract_first_heading(section_text),
-                'file_name': file_name
+                'heading': '電子添文' if is_xml else DocumentLoader._extract_first_heading(section_text),
+                'file_name': document.file_name
             })
         
         return sections
     
-    def _extract_first_heading(self, text: str) -> Optional[str]:
+    @staticmethod
+    def _extract_first_heading(text: str) -> Optional[str]:
         """テキストから最初の見出しを抽出"""
         lines = text.split('\n')[:5]  # 最初の5行を確認
         
         for line in lines:
             line = line.strip()
             # 数字や記号で始まる見出しらしい行
-            if re.match(r'^[\d\【].{3,50}', line):
+            if _RE_HEADING.match(line):
                 return line
         
         return None
 
-    def load_pdf(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def load_pdf(self, file_path: Path) -> Optional[Document]:
         """
         PDFファイルを読み込んでテキストとメタデータを返す
 
@@ -122,39 +277,54 @@ class DocumentLoader:
             file_path: PDFファイルのパス
 
         Returns:
-            dict: 文書情報
+            Document: 文書情報
         """
         try:
-            reader = PdfReader(file_path)
-
-            full_text_parts: List[str] = []
-            for page_num, page in enumerate(reader.pages, 1):
-                page_text = page.extract_text() or ""
-                full_text_parts.append(f"\n--- ページ {page_num} ---\n{page_text}")
-            full_text = "".join(full_text_parts)
+            cache_path = self._cache_path(file_path)
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                return cached
+            
+            with fitz.open(str(file_path)) as pdf:
+                full_text_parts: List[str] = []
+                page_spans: List[Tuple[int, int]] = []
+                offset = 0
+                for page_num, page in enumerate(pdf, 1):
+                    page_text = page.get_text('text')
+                    page_header = f"\n--- ページ {page_num} ---\n"
+                    
+                    # セクション分割時に区切り文字列を再解析しなくて済むようページ位置を記録
+                    start = offset + len(page_header)
+                    offset = start + len(page_text)
+                    page_spans.append((start, offset))
+                    
+                    full_text_parts.append(page_header)
+                    full_text_parts.append(page_text)
+                full_text = "".join(full_text_parts)
+                page_count = pdf.page_count
             
             # 文書タイプの判定
             doc_type = self._detect_document_type(file_path.name)
             
-            # セクション分割
-            sections = self._extract_sections_from_text(full_text, file_path.name)
+            doc = Document(
+                full_text=full_text,
+                file_name=file_path.name,
+                file_path=str(file_path),
+                pages=page_count,
+                doc_type=doc_type,
+                doc_type_ja=doc_type,
+                page_spans=page_spans,
+            )
+            self._write_cache(cache_path, doc)
             
-            return {
-                'full_text': full_text,
-                'sections': sections,
-                'file_name': file_path.name,
-                'file_path': str(file_path),
-                'pages': len(reader.pages),
-                'doc_type': doc_type,
-                'doc_type_ja': doc_type
-            }
+            return doc
             
         except Exception as e:
             print(f"❌ PDFの読み込みに失敗: {file_path.name}")
             print(f"   エラー: {str(e)}")
             return None
 
-    def load_xml(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def load_xml(self, file_path: Path) -> Optional[Document]:
         """
         XMLファイル(電子添文)を読み込む
         
@@ -162,102 +332,133 @@ class DocumentLoader:
             file_path: XMLファイルのパス
             
         Returns:
-            dict: 文書情報
+            Document: 文書情報
         """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+            cache_path = self._cache_path(file_path)
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                return cached
             
-            # XMLをテキストに変換（簡易版）
-            text = ET.tostring(root, encoding='unicode', method='text')
+            # XMLをテキストに変換（簡易版）- 要素木を作らずに文字データだけを逐次収集
+            parser = ET.XMLParser(target=_XmlTextCollector())
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_XML_READ_CHUNK_SIZE), b''):
+                    parser.feed(chunk)
+            text = parser.close()
             
-            sections = [{
-                'text': self._clean_text(text),
-                'page': None,
-                'heading': '電子添文',
-                'file_name': file_path.name
-            }]
+            doc = Document(
+                full_text=text,
+                file_name=file_path.name,
+                file_path=str(file_path),
+                pages=None,
+                doc_type='電子添文',
+                doc_type_ja='電子添文',
+            )
+            self._write_cache(cache_path, doc)
             
-            return {
-                'full_text': text,
-                'sections': sections,
-                'file_name': file_path.name,
-                'file_path': str(file_path),
-                'pages': None,
-                'doc_type': '電子添文',
-                'doc_type_ja': '電子添文'
-            }
+            return doc
             
         except Exception as e:
             print(f"❌ XMLの読み込みに失敗: {file_path.name}")
             print(f"   エラー: {str(e)}")
             return None
 
-    def load_product_documents(self, product_type: str, company_type: str) -> List[Dict[str, Any]]:
+    def _collect_product_files(
+        self,
+        product_type: str,
+        company_type: str,
+        doc_type_filter: Optional[Set[str]] = None
+    ) -> List[Path]:
         """
-        指定された製品タイプと会社タイプの文書を読み込む
-        
+        指定された製品タイプと会社タイプの文書ファイルを列挙する（読み込みは行わない）
+
         Args:
             product_type: "血漿分画製剤", "IBD製剤", "抗うつ製剤" など
             company_type: "自社" or "他社"
-            
+            doc_type_filter: 対象とする文書タイプの集合（Noneなら全て）
+
         Returns:
-            List[Dict]: 読み込んだ文書のリスト
+            List[Path]: PDF・XMLファイルのパスのリスト
         """
-        documents = []
-        
         # データフォルダのパス
         folder_path = self.data_dir / product_type / company_type
         
         if not folder_path.exists():
             print(f"⚠️ フォルダが存在しません: {folder_path}")
-            return documents
+            return []
+        
+        # PDFとXMLファイルを再帰的に探索（1回の走査で両方を振り分ける）
+        pdf_files: List[Path] = []
+        xml_files: List[Path] = []
+        for entry in _walk_document_files(str(folder_path)):
+            if entry.name.endswith('.pdf'):
+                pdf_files.append(Path(entry.path))
+            else:
+                xml_files.append(Path(entry.path))
         
-        # PDFとXMLファイルを再帰的に探索
-        pdf_files = list(folder_path.rglob("*.pdf"))
-        xml_files = list(folder_path.rglob("*.xml"))
+        print(f"  📂 {len(pdf_files) + len(xml_files)}個のファイルを発見 (PDF: {len(pdf_files)}, XML: {len(xml_files)})")
         
         all_files = pdf_files + xml_files
         
-        print(f"  📂 {len(all_files)}個のファイルを発見 (PDF: {len(pdf_files)}, XML: {len(xml_files)})")
+        # 文書タイプはファイル名だけで判定できるので、対象外のファイルは開く前に除外する
+        if doc_type_filter is not None:
+            all_files = [f for f in all_files if self._detect_document_type(f.name) in doc_type_filter]
+            print(f"  🔎 文書タイプで絞り込み: {len(all_files)}個のファイルが対象")
         
-        # 各ファイルを読み込み
-        for file_path in all_files:
-            if file_path.suffix == '.pdf':
-                doc = self.load_pdf(file_path)
-            elif file_path.suffix == '.xml':
-                doc = self.load_xml(file_path)
-            else:
-                continue
+        return all_files
+
+    def load_product_documents(
+        self,
+        product_type: str,
+        company_type: str,
+        doc_type_filter: Optional[Set[str]] = None
+    ) -> List[Document]:
+        """
+        指定された製品タイプと会社タイプの文書を読み込む
+        
+        Args:
+            product_type: "血漿分画製剤", "IBD製剤", "抗うつ製剤" など
+            company_type: "自社" or "他社"
+            doc_type_filter: 読み込む文書タイプの集合（例: {'インタビューフォーム'}）。Noneなら全て
             
+        Returns:
+            List[Document]: 読み込んだ文書のリスト
+        """
+        all_files = self._collect_product_files(product_type, company_type, doc_type_filter)
+        
+        # PyMuPDFはマルチスレッドでの利用に対応していないため順番に読み込む
+        documents = []
+        for file_path in all_files:
+            doc = _load_one(str(self.data_dir), file_path, product_type, company_type)
             if doc:
-                # メタデータを追加
-                doc['product_type'] = product_type
-                doc['company_type'] = company_type
-                
-                # 製品名を推定（フォルダ名から）
-                product_name = file_path.parent.name
-                doc['product_name'] = product_name
-                
                 documents.append(doc)
         
         return documents
     
-    def load_all_documents(self) -> List[Dict[str, Any]]:
+    def load_all_documents(self, doc_type_filter: Optional[Set[str]] = None) -> List[Document]:
         """
         全製品タイプ、全会社タイプの文書を読み込む
+
+        ファイルの列挙後、キャッシュにある文書はそのまま使い、残りを解析する。
+        解析は fork 方式のプロセスプールで並列に実行するが、fork が使えない環境
+        (macOS・Windowsの既定のspawn方式を含む) や Streamlit アプリからの呼び出しでは
+        安全のため1ファイルずつ順番に解析する。
+        
+        Args:
+            doc_type_filter: 読み込む文書タイプの集合（例: {'インタビューフォーム'}）。Noneなら全て
         
         Returns:
-            List[Dict]: 読み込んだ全文書のリスト
+            List[Document]: 読み込んだ全文書のリスト
         """
-        all_documents = []
-        
         # 製品タイプの定義
         product_types = ["血漿分画製剤", "IBD製剤", "抗うつ製剤"]
         company_types = ["自社", "他社"]
         
         print("\n=== 全製品の文書を読み込み ===")
         
+        # (データフォルダ, ファイルパス, 製品タイプ, 会社タイプ) のタスクを先に全て集める
+        tasks: List[Tuple[str, Path, str, str]] = []
         for product_type in product_types:
             product_path = self.data_dir / product_type
             if not product_path.exists():
@@ -268,15 +469,55 @@ class DocumentLoader:
             
             for company_type in company_types:
                 print(f"  {company_type}:")
-                docs = self.load_product_documents(product_type, company_type)
-                all_documents.extend(docs)
-                print(f"    → {len(docs)}文書読み込み完了")
+                for file_path in self._collect_product_files(product_type, company_type, doc_type_filter):
+                    tasks.append((str(self.data_dir), file_path, product_type, company_type))
+        
+        # キャッシュにある文書は親プロセスで読み込み、解析が必要なものだけを残す
+        results: List[Optional[Document]] = []
+        pending: List[int] = []
+        for i, (_, file_path, product_type, company_type) in enumerate(tasks):
+            doc = self._load_cached(file_path)
+            if doc is not None:
+                _set_product_metadata(doc, file_path, product_type, company_type)
+            else:
+                pending.append(i)
+            results.append(doc)
+        
+        pending_tasks = [tasks[i] for i in pending]
+        if len(pending_tasks) > 1 and _can_use_process_pool():
+            # PDFの解析はCPUバウンドなのでプロセス単位で並列化
+            with ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('fork')
+            ) as executor:
+                loaded = list(executor.map(_load_one, *zip(*pending_tasks), chunksize=4))
+        else:
+            loaded = [_load_one(*task) for task in pending_tasks]
+        
+        for i, doc in zip(pending, loaded):
+            results[i] = doc
+        all_documents = [doc for doc in results if doc]
+        
+        print(f"\n  → {len(all_documents)}文書読み込み完了")
         
         return all_documents
     
     def get_available_products(self) -> Dict[str, Dict[str, List[str]]]:
         """
-        利用可能な全製品リストを取得
+        利用可能な全製品リストを取得（結果は一定時間キャッシュされる）
+        
+        Returns:
+            Dict: {
+                '血漿分画製剤': {'自社': [...], '他社': [...]},
+                'IBD製剤': {'自社': [...], '他社': [...]},
+                '抗うつ製剤': {'自社': [...], '他社': [...]}
+            }
+        """
+        return _cached_available_products(str(self.data_dir))
+    
+    def _scan_available_products(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        データフォルダを走査して利用可能な全製品リストを取得
         
         Returns:
             Dict: {
@@ -306,52 +547,51 @@ class DocumentLoader:
         
         return products
     
-    def get_document_stats(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_document_stats(self, documents: List[Document]) -> Dict[str, Any]:
         """
         読み込んだ文書の統計情報を取得する。
 
         Args:
-            documents: 文書辞書のリスト
+            documents: 文書のリスト
 
         Returns:
             total_docs, by_type, by_product, by_product_type, by_company を含む辞書
         """
         stats = {
             'total_docs': len(documents),
-            'by_type': {},
-            'by_product': {},
-            'by_product_type': {},
-            'by_company': {}
-        }
-        
-        for doc in documents:
             # 文書タイプ別
-            doc_type = doc.get('doc_type_ja', '不明')
-            stats['by_type'][doc_type] = stats['by_type'].get(doc_type, 0) + 1
-            
+            'by_type': Counter(doc.doc_type_ja or '不明' for doc in documents),
             # 製品別
-            product = doc.get('product_name', '不明')
-            stats['by_product'][product] = stats['by_product'].get(product, 0) + 1
-            
+            'by_product': Counter(doc.product_name or '不明' for doc in documents),
             # 製品タイプ別
-            product_type = doc.get('product_type', '不明')
-            stats['by_product_type'][product_type] = stats['by_product_type'].get(product_type, 0) + 1
-            
+            'by_product_type': Counter(doc.product_type or '不明' for doc in documents),
             # 会社タイプ別
-            company_type = doc.get('company_type', '不明')
-            stats['by_company'][company_type] = stats['by_company'].get(company_type, 0) + 1
+            'by_company': Counter(doc.company_type or '不明' for doc in documents)
+        }
         
         return stats
 
     def load_drug_prices(self) -> Dict[str, Any]:
         """
-        薬価情報を読み込む。
+        薬価情報を読み込む。結果は一定時間キャッシュされる。
+
+        Returns:
+            {'注射剤': DataFrame, '内服薬': DataFrame, ...} の辞書
+        """
+        return _cached_drug_prices(str(self.data_dir))
+
+    def _read_drug_prices(self) -> Dict[str, Any]:
+        """
+        薬価フォルダのExcelファイルを読み込む。
 
         Returns:
             {'注射剤': DataFrame, '内服薬': DataFrame, ...} の辞書
         """
         import pandas as pd
 
+        # python-calamine が入っていれば高速なcalamineエンジンを使う（なければ既定のopenpyxl）
+        engine = 'calamine' if importlib.util.find_spec('python_calamine') else None
+
         prices: Dict[str, Any] = {}
         price_dir = self.data_dir / "薬価"
 
@@ -363,10 +603,19 @@ class DocumentLoader:
         print(f"\n=== 薬価ファイルを読み込み ===")
         print(f"発見したファイル数: {len(excel_files)}")
 
-        for excel_file in excel_files:
-            try:
+        if not excel_files:
+            return prices
+
+        # 各ファイルは独立しているのでスレッドで並列に読み込む
+        with ThreadPoolExecutor(max_workers=min(8, len(excel_files))) as executor:
+            futures = []
+            for excel_file in excel_files:
                 print(f"  読み込み中: {excel_file.name}")
-                df = pd.read_excel(excel_file)
+                futures.append(executor.submit(pd.read_excel, excel_file, engine=engine))
+
+        for excel_file, future in zip(excel_files, futures):
+            try:
+                df = future.result()
 
                 if '注射剤' in excel_file.name:
                     prices['注射剤'] = df
@@ -375,7 +624,7 @@ class DocumentLoader:
                 else:
                     prices[excel_file.stem] = df
 
-                print(f"    → {len(df)}行 × {len(df.columns)}列")
+                print(f"  読み込み完了: {excel_file.name} → {len(df)}行 × {len(df.columns)}列")
 
             except Exception as e:
                 print(f"❌ 薬価ファイルの読み込みに失敗: {excel_file.name}")
@@ -384,61 +633,111 @@ class DocumentLoader:
         return prices
 
 
+@st.cache_data(ttl=_LISTING_CACHE_TTL, show_spinner=False)
+def _cached_available_products(data_dir: str) -> Dict[str, Dict[str, List[str]]]:
+    """データフォルダごとに製品一覧をキャッシュする"""
+    return DocumentLoader(data_dir)._scan_available_products()
+
+
+@st.cache_data(ttl=_LISTING_CACHE_TTL, show_spinner=False)
+def _cached_drug_prices(data_dir: str) -> Dict[str, Any]:
+    """データフォルダごとに薬価情報をキャッシュする"""
+    return DocumentLoader(data_dir)._read_drug_prices()
+
+
+def _load_one(data_dir: str, file_path: Path, product_type: str, company_type: str) -> Optional[Document]:
+    """
+    1ファイル分の文書を読み込み、製品メタデータを付与する
+
+    プロセスプールから呼び出せるようモジュールレベルに定義している。
+
+    Args:
+        data_dir: データフォルダのパス
+        file_path: PDFまたはXMLファイルのパス
+        product_type: 製品タイプ
+        company_type: 会社タイプ
+
+    Returns:
+        Document: 文書情報（読み込めなかった場合はNone）
+    """
+    loader = DocumentLoader(data_dir)
+    
+    if file_path.suffix == '.pdf':
+        doc = loader.load_pdf(file_path)
+    elif file_path.suffix == '.xml':
+        doc = loader.load_xml(file_path)
+    else:
+        return None
+    
+    if doc:
+        _set_product_metadata(doc, file_path, product_type, company_type)
+    
+    return doc
+
+
+def _set_product_metadata(doc: Document, file_path: Path, product_type: str, company_type: str) -> None:
+    """文書に製品タイプ・会社タイプ・製品名のメタデータを付与する"""
+    doc.product_type = product_type
+    doc.company_type = company_type
+    
+    # 製品名を推定（フォルダ名から）
+    doc.product_name = file_path.parent.name
+
+
 def test_loader() -> None:
-    """データローダーの動作確認用。"""
+    """データローダーの動作確認用。出力は行をまとめてから一度に書き出す。"""
     loader = DocumentLoader()
     
-    print("=" * 70)
-    print("=== 利用可能な製品一覧 ===")
+    lines = ["=" * 70, "=== 利用可能な製品一覧 ==="]
     products = loader.get_available_products()
     for product_type, companies in products.items():
-        print(f"\n【{product_type}】")
+        lines.append(f"\n【{product_type}】")
         for company_type, product_list in companies.items():
-            print(f"  {company_type}: {len(product_list)}製品")
+            lines.append(f"  {company_type}: {len(product_list)}製品")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # 全文書を読み込み
     all_docs = loader.load_all_documents()
     
-    print("\n" + "=" * 70)
-    print(f"=== 読み込み完了 ===")
-    print(f"総文書数: {len(all_docs)}")
+    lines = [
+        "\n" + "=" * 70,
+        "=== 読み込み完了 ===",
+        f"総文書数: {len(all_docs)}",
+    ]
     
     if all_docs:
         stats = loader.get_document_stats(all_docs)
         
-        print(f"\n【製品タイプ別】")
-        for product_type, count in stats['by_product_type'].items():
-            print(f"  {product_type}: {count}文書")
-        
-        print(f"\n【会社タイプ別】")
-        for company_type, count in stats['by_company'].items():
-            print(f"  {company_type}: {count}文書")
-        
-        print(f"\n【文書タイプ別】")
-        for doc_type, count in stats['by_type'].items():
-            print(f"  {doc_type}: {count}文書")
+        stat_sections = (
+            ('製品タイプ別', 'by_product_type'),
+            ('会社タイプ別', 'by_company'),
+            ('文書タイプ別', 'by_type'),
+        )
+        for title, key in stat_sections:
+            lines.append(f"\n【{title}】")
+            for name, count in stats[key].most_common():
+                lines.append(f"  {name}: {count}文書")
         
         # IFファイルの統計
-        if_docs = [d for d in all_docs if d['doc_type'] == 'インタビューフォーム']
-        print(f"\n【インタビューフォーム】")
-        print(f"  総数: {len(if_docs)}文書")
-        if_by_product = {}
-        for doc in if_docs:
-            pt = doc['product_type']
-            if_by_product[pt] = if_by_product.get(pt, 0) + 1
-        for pt, count in if_by_product.items():
-            print(f"  {pt}: {count}文書")
+        if_docs = [d for d in all_docs if d.doc_type == 'インタビューフォーム']
+        lines.append("\n【インタビューフォーム】")
+        lines.append(f"  総数: {len(if_docs)}文書")
+        for pt, count in Counter(d.product_type for d in if_docs).most_common():
+            lines.append(f"  {pt}: {count}文書")
+    
+    lines.append("\n" + "=" * 70)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # 薬価情報の読み込み
-    print("\n" + "=" * 70)
     prices = loader.load_drug_prices()
     
     if prices:
-        print(f"\n【薬価データ】")
+        lines = ["\n【薬価データ】"]
         for category, df in prices.items():
-            print(f"  {category}: {len(df)}行")
+            lines.append(f"  {category}: {len(df)}行")
             if len(df) > 0:
-                print(f"    列: {list(df.columns[:5])}...")
+                lines.append(f"    列: {list(df.columns[:5])}...")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":